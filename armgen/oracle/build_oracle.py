@@ -79,7 +79,8 @@ def build_single_task(task_dict: dict[str, Any]) -> dict[str, Any]:
     if result.success:
         # Generate metadata
         metadata = generate_metadata(
-            output_path, program, target, config, result.command
+            output_path, program, target, config, result.command,
+            md5=task_dict.get("md5", False),
         )
         save_metadata(metadata, output_path)
 
@@ -211,6 +212,11 @@ def main():
         default=8,
         help="Number of parallel build jobs",
     )
+    parser.add_argument(
+        "--md5",
+        action="store_true",
+        help="Also record MD5 hashes in binary metadata (SHA256 is always recorded)",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -302,6 +308,8 @@ def main():
 
     # Convert tasks to dicts for multiprocessing
     task_dicts = [task_to_dict(task) for task in tasks]
+    for td in task_dicts:
+        td["md5"] = args.md5
 
     completed = 0
     success = 0
@@ -343,7 +351,7 @@ def main():
                         cpu=meta_dict["compilation"]["cpu"],
                         compiler_command=meta_dict["compilation"]["command"],
                         sha256=meta_dict["hashes"]["sha256"],
-                        md5=meta_dict["hashes"]["md5"],
+                        md5=meta_dict["hashes"].get("md5"),
                         build_timestamp=meta_dict["build_timestamp"],
                     )
                     manifest.add_success(metadata, result["task_id"].split("_")[-1])
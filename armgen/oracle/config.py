@@ -44,7 +44,7 @@ class TargetConfig:
     extra_flags: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class CompilationConfig:
     optimization: str  # "O0", "O1", "O2", "O3", "Os", "Oz", "Ofast"
     debug: str = "none"  # "none", "line_tables", "dwarf2", "dwarf4", "dwarf5"
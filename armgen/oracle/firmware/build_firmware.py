@@ -551,6 +551,13 @@ def main() -> None:
         default=8,
         help="Number of parallel generation jobs",
     )
+    parser.add_argument(
+        "--layout-jobs",
+        type=int,
+        default=1,
+        help="Worker processes for layout generation (default: 1; only "
+             "pays off for very large --num-images on many cores)",
+    )
     parser.add_argument(
         "--extract-only",
         action="store_true",
@@ -594,6 +601,7 @@ def main() -> None:
         max_size=args.max_size,
         multi_isa_probability=args.multi_isa_probability,
         parallel_jobs=args.jobs,
+        layout_jobs=args.layout_jobs,
         oracle_output_dir=args.oracle_output,
         objects_dir=args.objects_dir,
         firmware_dir=args.firmware_dir,
@@ -654,7 +662,9 @@ def main() -> None:
     # -----------------------------------------------------------------------
     log.info("Phase 3: Generating %d image layouts (seed=%d)", config.num_images, config.seed)
     engine = LayoutEngine(blob_index, config)
-    layouts = engine.generate_batch(config.num_images, config.seed)
+    layouts = engine.generate_batch(
+        config.num_images, config.seed, jobs=config.layout_jobs,
+    )
 
     # Report layout statistics
     multi_count = sum(1 for l in layouts if l.is_multi_isa)
@@ -275,6 +275,7 @@ class FirmwareGenConfig:
     max_size: int = 16 * 1024 * 1024  # 16 MiB
     multi_isa_probability: float = 0.15
     parallel_jobs: int = 8
+    layout_jobs: int = 1  # layouts are cheap; workers rarely beat unpickling
     oracle_output_dir: Path = field(default_factory=lambda: Path("../output"))
     objects_dir: Path = field(default_factory=lambda: Path("../objects"))
     firmware_dir: Path = field(default_factory=lambda: Path("../firmware"))
@@ -26,6 +26,13 @@ class TrailerResult:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
+# Precompiled fixed-layout formats
+_WORDS8 = {"little": struct.Struct("<8I"), "big": struct.Struct(">8I")}
+_MSP430_VECTORS = struct.Struct("<16H")
+_UBOOT_HEADER = struct.Struct(">IIIIIIIBBBB32s")
+_MBN_HEADER = struct.Struct("<IIIIIIIIII")
+
+
 # ---------------------------------------------------------------------------
 # ISA-specific vector tables
 # ---------------------------------------------------------------------------
@@ -39,13 +46,17 @@ def vector_table_cortexm(
     followed by 14 exception vectors (NMI, HardFault, etc.).
     64 bytes minimum (16 vectors × 4 bytes).
     """
+    # Bind RNG methods once; the handler loop below runs up to 62 times
+    choice = rng.choice
+    randint = rng.randint
+
     base_addr = kwargs.get("base_addr", 0x08000000)
-    num_vectors = rng.choice([16, 32, 48, 64])  # 64–256 bytes
+    num_vectors = choice([16, 32, 48, 64])  # 64–256 bytes
     fmt = "<I"  # Cortex-M is always little-endian
 
     vectors = []
     # Initial SP — typically top of SRAM
-    sp = rng.choice([0x20005000, 0x20010000, 0x20020000, 0x20040000])
+    sp = choice([0x20005000, 0x20010000, 0x20020000, 0x20040000])
     vectors.append(sp)
 
     # Reset vector → points to code start (must be odd for Thumb)
@@ -54,7 +65,7 @@ def vector_table_cortexm(
 
     # Remaining exception vectors — plausible handler addresses
     for i in range(num_vectors - 2):
-        handler = base_addr + (num_vectors * 4) + rng.randint(0, 0x1000)
+        handler = base_addr + (num_vectors * 4) + randint(0, 0x1000)
         handler |= 1  # Thumb bit
         vectors.append(handler)
 
@@ -74,18 +85,19 @@ def vector_table_arm(
     Each is a B (branch) instruction: 0xEA000000 + offset.
     32 bytes total.
     """
-    fmt = "<I" if endianness == "little" else ">I"
+    randint = rng.randint
     vectors = []
     for i in range(8):
         # ARM branch: 0xEA000000 | (offset >> 2 - 2)
         # Point to somewhere reasonable after the table
-        target_offset = 32 + rng.randint(0, 0x800)
+        target_offset = 32 + randint(0, 0x800)
         branch_offset = (target_offset - (i * 4) - 8) >> 2
         branch_offset &= 0x00FFFFFF
         instr = 0xEA000000 | branch_offset
         vectors.append(instr)
 
-    data = b"".join(struct.pack(fmt, v) for v in vectors)
+    words = _WORDS8["little" if endianness == "little" else "big"]
+    data = words.pack(*vectors)
     return HeaderResult(
         data=data,
         entry_point_offset=len(data),
@@ -102,7 +114,6 @@ def boot_vector_mips(
     16 bytes (4 instructions including branch delay slot NOP).
     """
     base_addr = kwargs.get("base_addr", 0xBFC00000)
-    fmt = ">I" if endianness == "big" else "<I"
 
     # Target address (code entry after header)
     target = base_addr + 32
@@ -124,7 +135,7 @@ def boot_vector_mips(
     while len(instrs) < 8:
         instrs.append(0x00000000)  # NOP padding
 
-    data = b"".join(struct.pack(fmt, i) for i in instrs)
+    data = _WORDS8["big" if endianness == "big" else "little"].pack(*instrs)
     return HeaderResult(
         data=data,
         entry_point_offset=len(data),
@@ -141,30 +152,34 @@ def avr_vector_table(
     Each vector is 2 bytes (RJMP) or 4 bytes (JMP for larger devices).
     """
     # AVR is always little-endian
-    use_jmp = rng.choice([True, False])
-    num_vectors = rng.choice([26, 35, 57])
+    choice = rng.choice
+    randint = rng.randint
+
+    use_jmp = choice([True, False])
+    num_vectors = choice([26, 35, 57])
 
-    vectors = bytearray()
+    words = []
     if use_jmp:
         # JMP instructions (4 bytes each): 0x940C + 16-bit addr
         vec_size = 4
         for i in range(num_vectors):
-            target = num_vectors * vec_size + rng.randint(0, 0x100)
+            target = num_vectors * vec_size + randint(0, 0x100)
             # JMP encoding: 1001_010k_kkkk_110k kkkk_kkkk_kkkk_kkkk
             lo = target & 0xFFFF
             hi = (target >> 16) & 0x3F
             word1 = 0x940C | ((hi & 0x3E) << 3) | (hi & 0x01)
-            vectors.extend(struct.pack("<HH", word1, lo))
+            words.append(word1)
+            words.append(lo)
     else:
         # RJMP instructions (2 bytes each): 0xCxxx
         vec_size = 2
         for i in range(num_vectors):
-            target_offset = num_vectors - i - 1 + rng.randint(0, 0x20)
+            target_offset = num_vectors - i - 1 + randint(0, 0x20)
             target_offset &= 0x0FFF
             rjmp = 0xC000 | target_offset
-            vectors.extend(struct.pack("<H", rjmp))
+            words.append(rjmp)
 
-    data = bytes(vectors)
+    data = struct.pack(f"<{len(words)}H", *words)
     return HeaderResult(
         data=data,
         entry_point_offset=len(data),
@@ -185,14 +200,15 @@ def msp430_vector_table(
     32 bytes total.
     """
     # MSP430 is little-endian
+    randint = rng.randint
     vectors = []
     code_base = rng.choice([0xC000, 0xC200, 0xE000, 0xF000])
     for i in range(16):
-        addr = code_base + rng.randint(0, 0x1000)
+        addr = code_base + randint(0, 0x1000)
         addr &= 0xFFFE  # must be even
         vectors.append(addr)
 
-    data = struct.pack("<16H", *vectors)
+    data = _MSP430_VECTORS.pack(*vectors)
     return HeaderResult(
         data=data,
         entry_point_offset=0,  # MSP430 vectors are at end of flash, code is elsewhere
@@ -204,6 +220,28 @@ def msp430_vector_table(
 # Firmware container headers
 # ---------------------------------------------------------------------------
 
+# U-Boot image names, pre-padded to the 32-byte ih_name field
+_UBOOT_NAMES_PADDED: tuple[bytes, ...] = tuple(
+    n[:32].ljust(32, b"\x00")
+    for n in (
+        b"Linux Kernel Image",
+        b"U-Boot Firmware",
+        b"Ramdisk Image",
+        b"FIT Image",
+        b"OpenWrt firmware",
+    )
+)
+
+# Android kernel cmdlines, pre-padded to the 512-byte cmdline field
+_ANDROID_CMDLINES_PADDED: tuple[bytes, ...] = tuple(
+    c[:512].ljust(512, b"\x00")
+    for c in (
+        b"console=ttyMSM0,115200n8 androidboot.console=ttyMSM0",
+        b"console=ttyS0,115200 root=/dev/ram0 androidboot.hardware=qcom",
+        b"console=ttyHSL0,115200,n8 androidboot.console=ttyHSL0",
+    )
+)
+
 
 def uboot(
     endianness: str, rng: Random, code_offset: int = 0, **kwargs: Any
@@ -212,6 +250,8 @@ def uboot(
     U-Boot legacy image header: 64 bytes.
     Magic: 0x27051956, always big-endian header fields.
     """
+    choice = rng.choice
+
     image_size = kwargs.get("total_size", 65536)
     data_size = max(0, image_size - 64) & 0xFFFFFFFF
 
@@ -224,7 +264,7 @@ def uboot(
     load_addr = kwargs.get("base_addr", 0x80008000) & 0xFFFFFFFF
     ep = load_addr  # entry point = load address
 
-    os_type = rng.choice([5, 17, 20])  # Linux=5, firmware=17, flat_dt=20
+    os_type = choice([5, 17, 20])  # Linux=5, firmware=17, flat_dt=20
     arch_map = {
         "arm32": 2, "thumb": 2, "aarch64": 22,
         "x86": 6, "x86_64": 6,
@@ -234,23 +274,17 @@ def uboot(
     }
     family = kwargs.get("family_name", "arm32")
     arch = arch_map.get(family, 0)
-    img_type = rng.choice([2, 5])  # kernel=2, firmware=5
-    comp = rng.choice([0, 1, 2, 3])  # none, gzip, bzip2, lzma
+    img_type = choice([2, 5])  # kernel=2, firmware=5
+    comp = choice([0, 1, 2, 3])  # none, gzip, bzip2, lzma
 
     # Image name (32 bytes, null-padded)
-    names = [
-        b"Linux Kernel Image",
-        b"U-Boot Firmware",
-        b"Ramdisk Image",
-        b"FIT Image",
-        b"OpenWrt firmware",
-    ]
-    name = rng.choice(names)
-    name_padded = name[:32].ljust(32, b"\x00")
+    name_padded = choice(_UBOOT_NAMES_PADDED)
 
-    # Pack header (big-endian)
-    header = struct.pack(
-        ">IIIIIIIBBBB32s",
+    # Pack header (big-endian) with a zeroed CRC field
+    header = bytearray(64)
+    _UBOOT_HEADER.pack_into(
+        header,
+        0,
         magic,
         header_crc,
         timestamp,
@@ -265,13 +299,12 @@ def uboot(
         name_padded,
     )
 
-    # Compute header CRC (zero out CRC field first)
-    header_for_crc = header[:4] + b"\x00\x00\x00\x00" + header[8:]
-    crc = zlib.crc32(header_for_crc) & 0xFFFFFFFF
-    header = header[:4] + struct.pack(">I", crc) + header[8:]
+    # Compute header CRC over the buffer in place, then patch it in
+    crc = zlib.crc32(header) & 0xFFFFFFFF
+    struct.pack_into(">I", header, 4, crc)
 
     return HeaderResult(
-        data=header,
+        data=bytes(header),
         entry_point_offset=64,
         metadata={"header_type": "uboot", "arch": arch, "comp": comp},
     )
@@ -299,13 +332,7 @@ def android_boot(
     os_version = 0
 
     # cmdline (512 bytes + 1024 bytes extra)
-    cmdlines = [
-        b"console=ttyMSM0,115200n8 androidboot.console=ttyMSM0",
-        b"console=ttyS0,115200 root=/dev/ram0 androidboot.hardware=qcom",
-        b"console=ttyHSL0,115200,n8 androidboot.console=ttyHSL0",
-    ]
-    cmdline = rng.choice(cmdlines)
-    cmdline_padded = cmdline[:512].ljust(512, b"\x00")
+    cmdline_padded = rng.choice(_ANDROID_CMDLINES_PADDED)
 
     # SHA hash (32 bytes)
     sha = rng.randbytes(32)
@@ -346,21 +373,24 @@ def tplink(
     TP-Link firmware header: vendor info, version, hardware ID, MD5.
     512 bytes total.
     """
+    choice = rng.choice
+    randint = rng.randint
+
     image_size = kwargs.get("total_size", 65536)
 
     header = bytearray(512)
 
     # Vendor name at offset 0 (32 bytes)
-    vendor = rng.choice([b"TP-LINK Technologies", b"TP-LINK", b"Archer"])
+    vendor = choice([b"TP-LINK Technologies", b"TP-LINK", b"Archer"])
     header[0:len(vendor)] = vendor
 
     # Firmware version at offset 32 (32 bytes)
-    ver = f"ver. {rng.randint(1,5)}.{rng.randint(0,20)}.{rng.randint(0,9)}".encode()
+    ver = f"ver. {randint(1,5)}.{randint(0,20)}.{randint(0,9)}".encode()
     header[32:32 + len(ver)] = ver
 
     # Hardware ID at offset 64 (4 bytes, big-endian)
     hw_ids = [0x00000001, 0x07500002, 0x09700001, 0x0C500001]
-    struct.pack_into(">I", header, 64, rng.choice(hw_ids))
+    struct.pack_into(">I", header, 64, choice(hw_ids))
 
     # Firmware length at offset 68 (4 bytes, big-endian)
     struct.pack_into(">I", header, 68, image_size)
@@ -382,11 +412,13 @@ def mediatek(
     MediaTek bootloader header with BRLYT/BLOADER magic.
     512–2048 bytes.
     """
-    size = rng.choice([512, 1024, 2048])
+    choice = rng.choice
+
+    size = choice([512, 1024, 2048])
     header = bytearray(size)
 
     # Device header at offset 0
-    magic = rng.choice([b"BRLYT", b"BLOADER"])
+    magic = choice([b"BRLYT", b"BLOADER"])
     header[0:len(magic)] = magic
 
     # Version (4 bytes at offset 8)
@@ -400,7 +432,7 @@ def mediatek(
     struct.pack_into("<I", header, 16, boot_len)
 
     # Device info string at offset 32 (32 bytes)
-    dev_info = rng.choice([b"MT7621", b"MT7628", b"MT6753", b"MT8173"])
+    dev_info = choice([b"MT7621", b"MT7628", b"MT6753", b"MT8173"])
     header[32:32 + len(dev_info)] = dev_info
 
     return HeaderResult(
@@ -431,8 +463,7 @@ def qualcomm_mbn(
     cert_chain_size = 0
     magic = 0x00000005  # SBL magic
 
-    data = struct.pack(
-        "<IIIIIIIIII",
+    data = _MBN_HEADER.pack(
         image_id,
         header_vsn,
         image_src,
@@ -459,6 +490,8 @@ def bios_boot(
     x86 BIOS boot sector: JMP + NOP, BPB fields, 0x55AA signature.
     512 bytes total.
     """
+    choice = rng.choice
+
     header = bytearray(512)
 
     # JMP short + NOP (3 bytes)
@@ -469,15 +502,15 @@ def bios_boot(
 
     # OEM name (8 bytes at offset 3)
     oem_names = [b"MSWIN4.1", b"mkdosfs ", b"MSDOS5.0", b"IBM  3.3"]
-    oem = rng.choice(oem_names)
+    oem = choice(oem_names)
     header[3:11] = oem
 
     # BPB (BIOS Parameter Block) — realistic FAT16/32 values
     struct.pack_into("<H", header, 11, 512)  # bytes per sector
-    header[13] = rng.choice([1, 2, 4, 8])  # sectors per cluster
-    struct.pack_into("<H", header, 14, rng.choice([1, 32]))  # reserved sectors
+    header[13] = choice([1, 2, 4, 8])  # sectors per cluster
+    struct.pack_into("<H", header, 14, choice([1, 32]))  # reserved sectors
     header[16] = 2  # number of FATs
-    struct.pack_into("<H", header, 17, rng.choice([0, 512]))  # root entries
+    struct.pack_into("<H", header, 17, choice([0, 512]))  # root entries
     struct.pack_into("<H", header, 19, 0)  # total sectors 16
     header[21] = 0xF8  # media descriptor (hard disk)
 
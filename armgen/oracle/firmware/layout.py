@@ -1,10 +1,13 @@
 """Layout engine: section ordering, sizing, alignment for synthetic firmware."""
 
 import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from random import Random
-from typing import Any
+from typing import Any, Collection, Sequence
 
 from .config import (
     ISA_FAMILIES,
@@ -12,7 +15,7 @@ from .config import (
     FirmwareGenConfig,
     IsaFamily,
 )
-from .extractor import BlobIndex
+from .extractor import BlobIndex, BlobInfo
 
 
 class SectionType(Enum):
@@ -26,7 +29,7 @@ class SectionType(Enum):
     TRAILER = "trailer"
 
 
-@dataclass
+@dataclass(slots=True)
 class SectionSpec:
     """Specification for a single section in a firmware image."""
 
@@ -38,7 +41,7 @@ class SectionSpec:
     fill_params: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ImageLayout:
     """Complete layout specification for a firmware image."""
 
@@ -70,13 +73,13 @@ class ImageLayout:
 
 
 # Non-code section type weights
-_NON_CODE_WEIGHTS: dict[SectionType, float] = {
-    SectionType.PADDING: 40.0,
-    SectionType.STRING_TABLE: 15.0,
-    SectionType.FILESYSTEM: 10.0,
-    SectionType.RANDOM: 20.0,
-    SectionType.RODATA: 15.0,
-}
+_NON_CODE_OPTIONS: tuple[tuple[SectionType, float], ...] = (
+    (SectionType.PADDING, 40.0),
+    (SectionType.STRING_TABLE, 15.0),
+    (SectionType.FILESYSTEM, 10.0),
+    (SectionType.RANDOM, 20.0),
+    (SectionType.RODATA, 15.0),
+)
 
 # Trailer weights
 _TRAILER_WEIGHTS: list[tuple[str, float]] = [
@@ -86,6 +89,41 @@ _TRAILER_WEIGHTS: list[tuple[str, float]] = [
     ("none", 30.0),
 ]
 
+# Non-code section size bounds: (minimum, ceiling before max_size clamp)
+_NC_BOUNDS: dict[SectionType, tuple[int, int]] = {
+    SectionType.PADDING: (16, 65536),
+    SectionType.STRING_TABLE: (64, 4096),
+    SectionType.FILESYSTEM: (512, 65536),
+    SectionType.RANDOM: (32, 8192),
+    SectionType.RODATA: (64, 16384),
+}
+
+# Fill bytes for padding sections and filesystem types for FS sections
+_PAD_PATTERNS: tuple[int, ...] = (0xFF, 0x00, 0xAA, 0xDE)
+_FS_TYPES: tuple[str, ...] = ("squashfs", "jffs2", "cramfs", "romfs")
+
+# Blob repeat factors for code sections (biased toward a single copy)
+_CODE_MULTIPLIERS: tuple[int, ...] = (1, 1, 1, 2, 3)
+
+# Estimated header sizes for layout calculation (actual size is
+# determined at generation time)
+_HEADER_SIZES: dict[str, int] = {
+    "vector_table_cortexm": 64,
+    "vector_table_arm": 32,
+    "boot_vector_mips": 32,
+    "avr_vector_table": 128,
+    "msp430_vector_table": 32,
+    "uboot": 64,
+    "android_boot": 2048,
+    "tplink": 512,
+    "mediatek": 1024,
+    "qualcomm_mbn": 40,
+    "bios_boot": 512,
+    "uefi_stub": 512,
+    "opensbi_stub": 48,
+    "bare": 0,
+}
+
 # Trailer sizes for layout calculation
 _TRAILER_SIZES: dict[str, int] = {
     "crc32": 4,
@@ -95,23 +133,73 @@ _TRAILER_SIZES: dict[str, int] = {
 }
 
 
-def _weighted_choice(rng: Random, options: list[tuple[Any, float]]) -> Any:
-    """Pick from weighted options."""
-    total = sum(w for _, w in options)
-    r = rng.random() * total
-    cumulative = 0.0
-    for item, weight in options:
-        cumulative += weight
-        if r <= cumulative:
-            return item
-    return options[-1][0]
+class AliasSampler:
+    """O(1) weighted sampler over a fixed table (Vose's alias method).
+
+    The alias tables are built once; each draw then costs two
+    ``rng.random()`` calls and two table lookups, independent of the
+    number of options.
+    """
+
+    def __init__(self, options: Sequence[tuple[Any, float]]):
+        n = len(options)
+        if n == 0:
+            raise ValueError("AliasSampler needs at least one option")
+        total = sum(w for _, w in options)
+        if total <= 0:
+            raise ValueError("AliasSampler weights must sum to a positive value")
+
+        items = [item for item, _ in options]
+        scaled = [w * n / total for _, w in options]
+        prob = [1.0] * n
+        alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            lo = small.pop()
+            hi = large.pop()
+            prob[lo] = scaled[lo]
+            alias[lo] = hi
+            scaled[hi] = scaled[hi] + scaled[lo] - 1.0
+            if scaled[hi] < 1.0:
+                small.append(hi)
+            else:
+                large.append(hi)
+        # Anything left over is full up to float rounding error
+
+        self._n = n
+        self._items: tuple[Any, ...] = tuple(items)
+        self._prob: tuple[float, ...] = tuple(prob)
+        self._alias: tuple[Any, ...] = tuple(items[a] for a in alias)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def sample(self, rng: Random) -> Any:
+        """Draw one item."""
+        i = int(rng.random() * self._n)
+        if rng.random() < self._prob[i]:
+            return self._items[i]
+        return self._alias[i]
+
+    def sample_excluding(self, rng: Random, excluded: Collection[Any]) -> Any:
+        """Draw one item not in ``excluded`` by rejection.
+
+        ``excluded`` must leave at least one positive-weight item.
+        """
+        while True:
+            item = self.sample(rng)
+            if item not in excluded:
+                return item
+
 
+_NON_CODE_ALIAS = AliasSampler(_NON_CODE_OPTIONS)
+_TRAILER_ALIAS = AliasSampler(_TRAILER_WEIGHTS)
 
-def _align_up(value: int, alignment: int) -> int:
-    """Round up to next alignment boundary."""
-    if alignment <= 1:
-        return value
-    return (value + alignment - 1) & ~(alignment - 1)
+
+# (master_seed, seq, primary_isa, forced_secondaries) for one batch layout
+_LayoutTask = tuple[int, int, str, list[str] | None]
 
 
 class LayoutEngine:
@@ -132,14 +220,41 @@ class LayoutEngine:
         if not self._family_weights:
             raise ValueError("No blobs available for any ISA family")
 
+        self._family_alias = AliasSampler(self._family_weights)
+
+        # Blob snapshot per family for O(1) picks in the code-section loop
+        self._blob_lists: dict[str, tuple[BlobInfo, ...]] = {
+            fam: tuple(blob_index.get_blobs(fam)) for fam in blob_index.families()
+        }
+
+        # Secondary-family samplers per primary, built on first use
+        self._secondary_alias: dict[str, AliasSampler | None] = {}
+
+        # Log-uniform size range, fixed for the engine's lifetime
+        self._log_min = math.log2(config.min_size)
+        self._log_span = math.log2(config.max_size) - self._log_min
+
+        # Header type options per family (families without any use "bare")
+        self._header_types: dict[str, tuple[str, ...]] = {
+            name: tuple(info.header_types)
+            for name, info in ISA_FAMILIES.items()
+            if info.header_types
+        }
+
+        # Code-section alignment per family (unknown families default to 4)
+        self._fam_align: dict[str, int] = {
+            name: info.alignment for name, info in ISA_FAMILIES.items()
+        }
+
     def _pick_primary_isa(self, rng: Random) -> str:
         """Select primary ISA family weighted by blob availability."""
-        return _weighted_choice(rng, self._family_weights)
+        return self._family_alias.sample(rng)
+
+    def _secondary_sampler(self, primary: str) -> AliasSampler | None:
+        """Alias sampler over secondary families for ``primary`` (cached)."""
+        if primary in self._secondary_alias:
+            return self._secondary_alias[primary]
 
-    def _pick_secondary_isas(
-        self, primary: str, rng: Random
-    ) -> list[str]:
-        """Pick 1–2 secondary ISA families using affinity table."""
         affinity = MULTI_ISA_AFFINITY.get(primary, [])
 
         # Filter to families we actually have blobs for
@@ -150,85 +265,73 @@ class LayoutEngine:
 
         if not available:
             # Fall back: pick any available family different from primary
-            fallback = [
+            available = [
                 (fam, 1.0) for fam, _ in self._family_weights
                 if fam != primary
             ]
-            if not fallback:
-                return []
-            available = fallback
+
+        sampler = AliasSampler(available) if available else None
+        self._secondary_alias[primary] = sampler
+        return sampler
+
+    def _pick_secondary_isas(
+        self, primary: str, rng: Random
+    ) -> list[str]:
+        """Pick 1–2 secondary ISA families using affinity table."""
+        sampler = self._secondary_sampler(primary)
+        if sampler is None:
+            return []
 
         count = rng.choice([1, 1, 2])  # bias toward 1 secondary
-        secondaries = []
-        pool = list(available)
-        for _ in range(min(count, len(pool))):
-            pick = _weighted_choice(rng, pool)
-            secondaries.append(pick)
-            pool = [(f, w) for f, w in pool if f != pick]
-            if not pool:
-                break
+        secondaries: list[str] = []
+        for _ in range(min(count, len(sampler))):
+            secondaries.append(sampler.sample_excluding(rng, secondaries))
 
         return secondaries
 
     def _pick_header_type(self, family: str, rng: Random) -> str:
         """Select header type from family's available types."""
-        family_info = ISA_FAMILIES.get(family)
-        if not family_info or not family_info.header_types:
+        header_types = self._header_types.get(family)
+        if not header_types:
             return "bare"
-        return rng.choice(family_info.header_types)
+        return rng.choice(header_types)
 
     def _pick_trailer_type(self, rng: Random) -> str:
         """Select trailer type from weighted options."""
-        return _weighted_choice(rng, _TRAILER_WEIGHTS)
+        return _TRAILER_ALIAS.sample(rng)
 
     def _pick_total_size(self, rng: Random) -> int:
         """Pick total image size via log-uniform distribution."""
-        log_min = math.log2(self.config.min_size)
-        log_max = math.log2(self.config.max_size)
-        log_size = rng.uniform(log_min, log_max)
+        log_size = self._log_min + self._log_span * rng.random()
         size = int(2 ** log_size)
         # Round to 256-byte boundary
-        return _align_up(size, 256)
+        return (size + 255) & ~255
 
     def _pick_non_code_section(self, rng: Random, max_size: int) -> tuple[SectionType, int, dict]:
         """Pick a non-code section type, size, and fill params."""
-        options = list(_NON_CODE_WEIGHTS.items())
-        section_type = _weighted_choice(rng, [(t, w) for t, w in options])
+        section_type = _NON_CODE_ALIAS.sample(rng)
+
+        lo, cap = _NC_BOUNDS[section_type]
+        if section_type == SectionType.PADDING:
+            # Padding: 16 bytes to 10% of max_size
+            cap = min(cap, max(64, max_size // 10))
+        size = rng.randint(lo, max(lo, min(cap, max_size)))
 
         params: dict[str, Any] = {}
 
         if section_type == SectionType.PADDING:
-            # Padding: 16 bytes to 10% of max_size
-            pad_max = max(16, min(max_size, 65536, max(64, max_size // 10)))
-            size = rng.randint(16, pad_max)
-            pattern = rng.choice([0xFF, 0x00, 0xAA, 0xDE])
+            pattern = rng.choice(_PAD_PATTERNS)
             params["pattern"] = f"0x{pattern:02X}"
             params["fill_byte"] = pattern
 
-        elif section_type == SectionType.STRING_TABLE:
-            hi = max(64, min(4096, max_size))
-            size = rng.randint(64, hi)
-            params["source"] = "generated"
-
         elif section_type == SectionType.FILESYSTEM:
-            hi = max(512, min(65536, max_size))
-            size = rng.randint(512, hi)
-            fs_types = ["squashfs", "jffs2", "cramfs", "romfs"]
-            params["fs_type"] = rng.choice(fs_types)
+            params["fs_type"] = rng.choice(_FS_TYPES)
 
         elif section_type == SectionType.RANDOM:
-            hi = max(32, min(8192, max_size))
-            size = rng.randint(32, hi)
             params["source"] = "random"
 
-        elif section_type == SectionType.RODATA:
-            hi = max(64, min(16384, max_size))
-            size = rng.randint(64, hi)
-            params["source"] = "generated"
-
         else:
-            hi = max(16, min(1024, max_size))
-            size = rng.randint(16, hi)
+            params["source"] = "generated"
 
         return section_type, size, params
 
@@ -270,30 +373,17 @@ class LayoutEngine:
         total_size = self._pick_total_size(rng)
 
         # 5. Build section list
+        # Section count is unbounded (large images hold thousands of code
+        # sections), so grow the list normally with a pre-bound append
         sections: list[SectionSpec] = []
+        add_section = sections.append
         cursor = 0
 
         # 5a. Header placeholder (actual size determined at generation time,
         #     but we estimate for layout)
-        header_sizes = {
-            "vector_table_cortexm": 64,
-            "vector_table_arm": 32,
-            "boot_vector_mips": 32,
-            "avr_vector_table": 128,
-            "msp430_vector_table": 32,
-            "uboot": 64,
-            "android_boot": 2048,
-            "tplink": 512,
-            "mediatek": 1024,
-            "qualcomm_mbn": 40,
-            "bios_boot": 512,
-            "uefi_stub": 512,
-            "opensbi_stub": 48,
-            "bare": 0,
-        }
-        header_size = header_sizes.get(header_type, 64)
+        header_size = _HEADER_SIZES.get(header_type, 64)
         if header_size > 0:
-            sections.append(SectionSpec(
+            add_section(SectionSpec(
                 offset=0,
                 size=header_size,
                 section_type=SectionType.HEADER,
@@ -313,33 +403,39 @@ class LayoutEngine:
         noncode_budget = usable_size - code_budget
 
         # 5c. Generate code sections
+        # Bind the RNG methods drawn on every iteration once up front
+        rand = rng.random
+        choice = rng.choice
+        randrange = rng.randrange
+
         code_remaining = code_budget
-        family_queue = list(all_families)  # cycle through families
+        family_queue = deque(all_families)  # cycle through families
 
         while code_remaining >= 64:
             # Pick which family for this code section
             fam = family_queue[0]
-            family_queue.append(family_queue.pop(0))  # rotate
+            family_queue.rotate(-1)
 
-            fam_info = ISA_FAMILIES.get(fam)
-            alignment = fam_info.alignment if fam_info else 4
+            alignment = self._fam_align.get(fam, 4)
+            align_mask = alignment - 1  # alignments are powers of two
 
             # Pick a blob to determine section size
-            blob = self.blob_index.get_random_blob(fam, rng)
-            if blob is None:
+            blobs = self._blob_lists.get(fam)
+            if not blobs:
                 # Skip this family if no blobs
-                family_queue = [f for f in family_queue if f != fam]
+                family_queue = deque(f for f in family_queue if f != fam)
                 if not family_queue:
                     break
                 continue
+            blob = blobs[randrange(len(blobs))]
 
             # Section size: blob size, possibly repeated/truncated
             blob_size = blob.size_bytes
             # Sometimes use multiple copies or a fraction
-            multiplier = rng.choice([1, 1, 1, 2, 3])
+            multiplier = choice(_CODE_MULTIPLIERS)
             section_size = min(blob_size * multiplier, code_remaining)
             section_size = max(section_size, min(blob_size, code_remaining))
-            section_size = _align_up(section_size, alignment)
+            section_size = (section_size + align_mask) & ~align_mask
 
             if section_size > code_remaining:
                 section_size = code_remaining
@@ -348,19 +444,19 @@ class LayoutEngine:
                 break
 
             # Align cursor
-            aligned_cursor = _align_up(cursor, alignment)
-            if aligned_cursor > cursor:
+            misalign = cursor & align_mask
+            if misalign:
                 # Insert alignment padding
-                pad_size = aligned_cursor - cursor
-                sections.append(SectionSpec(
+                pad_size = alignment - misalign
+                add_section(SectionSpec(
                     offset=cursor,
                     size=pad_size,
                     section_type=SectionType.PADDING,
                     fill_params={"pattern": "0xFF", "fill_byte": 0xFF},
                 ))
-                cursor = aligned_cursor
+                cursor += pad_size
 
-            sections.append(SectionSpec(
+            add_section(SectionSpec(
                 offset=cursor,
                 size=section_size,
                 section_type=SectionType.CODE,
@@ -377,10 +473,10 @@ class LayoutEngine:
             code_remaining -= section_size
 
             # Occasionally insert non-code between code sections
-            if rng.random() < 0.3 and noncode_budget >= 64:
+            if rand() < 0.3 and noncode_budget >= 64:
                 nc_type, nc_size, nc_params = self._pick_non_code_section(rng, noncode_budget)
                 nc_size = min(nc_size, noncode_budget)
-                sections.append(SectionSpec(
+                add_section(SectionSpec(
                     offset=cursor,
                     size=nc_size,
                     section_type=nc_type,
@@ -395,7 +491,7 @@ class LayoutEngine:
             nc_size = min(nc_size, noncode_budget, total_size - trailer_size - cursor)
             if nc_size < 16:
                 break
-            sections.append(SectionSpec(
+            add_section(SectionSpec(
                 offset=cursor,
                 size=nc_size,
                 section_type=nc_type,
@@ -407,7 +503,7 @@ class LayoutEngine:
         # 5e. Final padding to fill any gap before trailer
         gap = total_size - trailer_size - cursor
         if gap > 0:
-            sections.append(SectionSpec(
+            add_section(SectionSpec(
                 offset=cursor,
                 size=gap,
                 section_type=SectionType.PADDING,
@@ -415,9 +511,10 @@ class LayoutEngine:
             ))
             cursor += gap
 
-        # 5f. Trailer placeholder
+        # 5f. Trailer placeholder. A "none" trailer has size 0 and gets no
+        #     section, so the final padding above runs to the end of the image.
         if trailer_size > 0:
-            sections.append(SectionSpec(
+            add_section(SectionSpec(
                 offset=cursor,
                 size=trailer_size,
                 section_type=SectionType.TRAILER,
@@ -437,7 +534,31 @@ class LayoutEngine:
             seed=self.config.seed + seq,
         )
 
-    def generate_batch(self, count: int, master_seed: int) -> list[ImageLayout]:
+    def _run_layout_tasks(
+        self,
+        tasks: list[_LayoutTask],
+        executor: ProcessPoolExecutor | None,
+    ) -> list[ImageLayout]:
+        """Generate layouts for ``tasks`` in order, in-process or on ``executor``."""
+        if executor is not None and len(tasks) > 1:
+            return list(executor.map(_generate_layout_task, tasks, chunksize=64))
+
+        # One Random reseeded per layout: each layout still gets its own
+        # ``master_seed + seq`` stream without allocating a generator per seq
+        rng = Random()
+        layouts: list[ImageLayout] = []
+        for master_seed, seq, primary, secondaries in tasks:
+            rng.seed(master_seed + seq)
+            layouts.append(self.generate_layout(
+                rng, seq=seq,
+                primary_isa=primary,
+                forced_secondaries=secondaries,
+            ))
+        return layouts
+
+    def generate_batch(
+        self, count: int, master_seed: int, jobs: int = 1,
+    ) -> list[ImageLayout]:
         """Generate a batch of layouts with per-combo minimums.
 
         Phase 1: Generate ``count`` layouts with per-family quotas so
@@ -447,6 +568,12 @@ class LayoutEngine:
         ``config.min_images_per_combo`` images gets topped up with
         additional forced-combo layouts.
 
+        With ``jobs > 1`` each phase is spread across up to ``jobs`` worker
+        processes (capped at the CPU count); every layout is seeded from its
+        own ``seq``, so the result does not depend on ``jobs``. Shipping each
+        layout back costs a large fraction of generating it, so this only
+        helps for big batches on many cores.
+
         The final list is deterministically shuffled.
         """
         families = [fam for fam, _ in self._family_weights]
@@ -474,42 +601,75 @@ class LayoutEngine:
             for i in range(leftover):
                 quotas[sorted_fams[i % len(sorted_fams)][0]] += 1
 
-        layouts: list[ImageLayout] = []
-        seq = 0
-        for fam in families:
-            for _ in range(quotas[fam]):
-                rng = Random(master_seed + seq)
-                layout = self.generate_layout(rng, seq=seq, primary_isa=fam)
-                layouts.append(layout)
-                seq += 1
-
-        # --- Phase 2: fill under-represented combos ------------------------
-        combo_counts: dict[str, int] = {}
-        combo_primary: dict[str, str] = {}  # label → a known primary ISA
-        for layout in layouts:
-            label = layout.isa_label
-            combo_counts[label] = combo_counts.get(label, 0) + 1
-            combo_primary.setdefault(label, layout.primary_isa)
-
-        for label in sorted(combo_counts):
-            needed = min_per_combo - combo_counts[label]
-            if needed <= 0:
-                continue
-            primary = combo_primary[label]
-            combo_families = label.split("+")
-            secondaries = [f for f in combo_families if f != primary]
-            for _ in range(needed):
-                rng = Random(master_seed + seq)
-                layout = self.generate_layout(
-                    rng, seq=seq,
-                    primary_isa=primary,
-                    forced_secondaries=secondaries,
+        executor = None
+        jobs = min(jobs, os.cpu_count() or 1)
+        if jobs > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_layout_worker,
+                initargs=(self,),
+            )
+        try:
+            phase1: list[_LayoutTask] = [
+                (master_seed, seq, fam, None)
+                for seq, fam in enumerate(
+                    fam for fam in families for _ in range(quotas[fam])
                 )
-                layouts.append(layout)
-                seq += 1
+            ]
+            layouts = self._run_layout_tasks(phase1, executor)
+            seq = len(phase1)
+
+            # --- Phase 2: fill under-represented combos --------------------
+            combo_counts: dict[str, int] = {}
+            combo_primary: dict[str, str] = {}  # label → a known primary ISA
+            for layout in layouts:
+                label = layout.isa_label
+                combo_counts[label] = combo_counts.get(label, 0) + 1
+                combo_primary.setdefault(label, layout.primary_isa)
+
+            # Collect every top-up first so they run as one batch
+            phase2: list[_LayoutTask] = []
+            for label in sorted(combo_counts):
+                needed = min_per_combo - combo_counts[label]
+                if needed <= 0:
+                    continue
+                primary = combo_primary[label]
+                combo_families = label.split("+")
+                secondaries = [f for f in combo_families if f != primary]
+                for _ in range(needed):
+                    phase2.append((master_seed, seq, primary, secondaries))
+                    seq += 1
+            layouts.extend(self._run_layout_tasks(phase2, executor))
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
         # Deterministic shuffle so families are interleaved
         shuffle_rng = Random(master_seed)
         shuffle_rng.shuffle(layouts)
 
         return layouts
+
+
+# ---------------------------------------------------------------------------
+# Worker functions for parallel generate_batch (run in child processes)
+# ---------------------------------------------------------------------------
+
+_worker_engine: LayoutEngine | None = None
+
+
+def _init_layout_worker(engine: LayoutEngine) -> None:
+    """Install the engine shipped from the parent once per worker."""
+    global _worker_engine
+    _worker_engine = engine
+
+
+def _generate_layout_task(task: _LayoutTask) -> ImageLayout:
+    """Generate the layout for one ``(master_seed, seq, primary, secondaries)``."""
+    master_seed, seq, primary, secondaries = task
+    rng = Random(master_seed + seq)
+    return _worker_engine.generate_layout(
+        rng, seq=seq,
+        primary_isa=primary,
+        forced_secondaries=secondaries,
+    )
@@ -1,6 +1,7 @@
 """Configuration matrix expansion for generating all build combinations."""
 
 from dataclasses import dataclass
+from functools import lru_cache
 from itertools import product
 from pathlib import Path
 from typing import Iterator
@@ -118,21 +119,29 @@ def discover_programs(programs_dir: Path) -> list[ProgramConfig]:
     return programs
 
 
+# Program name prefix → category, longest prefix first
+_CATEGORY_PREFIXES: tuple[tuple[str, str], ...] = tuple(sorted(
+    (
+        ("min_", "minimal"),
+        ("simd_", "simd"),
+        ("fp_", "floating_point"),
+        ("int_", "integer"),
+        ("syscall_", "syscall"),
+        ("asm_", "assembly"),
+        ("cf_", "control_flow"),
+        ("call_", "calling_convention"),
+        ("mem_", "memory"),
+        ("cpp_", "cpp_features"),
+    ),
+    key=lambda pc: len(pc[0]),
+    reverse=True,
+))
+
+
+@lru_cache(maxsize=256)
 def categorize_program(name: str) -> str:
     """Categorize a program based on its name."""
-    prefixes = {
-        "min_": "minimal",
-        "simd_": "simd",
-        "fp_": "floating_point",
-        "int_": "integer",
-        "syscall_": "syscall",
-        "asm_": "assembly",
-        "cf_": "control_flow",
-        "call_": "calling_convention",
-        "mem_": "memory",
-        "cpp_": "cpp_features",
-    }
-    for prefix, category in prefixes.items():
+    for prefix, category in _CATEGORY_PREFIXES:
         if name.startswith(prefix):
             return category
     return "general"
@@ -163,7 +172,10 @@ def generate_build_matrix(
         # Get CPU options for this target if requested
         cpu_options = get_cpu_options(target_triple) if include_cpu_variants else ["generic"]
 
-        for program in programs:
+        # Configurations depend only on the target, so expand them (and
+        # their output directories) once and share them across programs
+        configs = [
+            (config, output_dir / target_triple / config.config_id())
             for config in expand_configurations(
                 optimizations=optimizations,
                 debug_levels=debug_levels,
@@ -171,10 +183,14 @@ def generate_build_matrix(
                 pic_modes=pic_modes,
                 ssp_modes=ssp_modes,
                 cpu_options=cpu_options,
-            ):
+            )
+        ]
+
+        for program in programs:
+            object_name = f"{program.name}.o"
+            for config, config_dir in configs:
                 # Determine output path (object file with .o extension)
-                config_dir = config.config_id()
-                output_path = output_dir / target_triple / config_dir / f"{program.name}.o"
+                output_path = config_dir / object_name
 
                 task = BuildTask(
                     program=program,
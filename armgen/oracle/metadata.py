@@ -2,15 +2,35 @@
 
 import hashlib
 import json
+import mmap
 import os
+import struct
 import subprocess
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from .config import ProgramConfig, TargetConfig, CompilationConfig
 
+try:
+    import magic
+except ImportError:  # python-magic/libmagic not installed; use file(1)
+    magic = None
+if magic is not None and not hasattr(magic, "Magic"):
+    # libmagic's own file-magic bindings also import as "magic" but have a
+    # different API; treat them as absent
+    magic = None
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib json module is used instead
+    orjson = None
+
+# In-process libmagic handle, loaded once per process on first use
+_MAGIC: Any = None
+
 
 @dataclass
 class BinaryMetadata:
@@ -41,15 +61,19 @@ class BinaryMetadata:
     cpu: str
     compiler_command: str
 
-    # Hashes
+    # Hashes (MD5 only when requested)
     sha256: str
-    md5: str
+    md5: str | None
 
     # Timestamps
     build_timestamp: str
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
+        hashes = {"sha256": self.sha256}
+        if self.md5 is not None:
+            hashes["md5"] = self.md5
+
         return {
             "binary": {
                 "path": self.path,
@@ -77,107 +101,260 @@ class BinaryMetadata:
                 "cpu": self.cpu,
                 "command": self.compiler_command,
             },
-            "hashes": {
-                "sha256": self.sha256,
-                "md5": self.md5,
-            },
+            "hashes": hashes,
             "build_timestamp": self.build_timestamp,
         }
 
 
-def compute_hashes(file_path: Path) -> tuple[str, str]:
-    """Compute SHA256 and MD5 hashes of a file."""
-    sha256_hash = hashlib.sha256()
-    md5_hash = hashlib.md5()
+# Files above this size are hashed through mmap; below it, mapping costs
+# more than a plain read
+_MMAP_MIN_SIZE = 1 << 20
+
+
+def _hash_mapped(fileno: int, digests: list) -> bytes:
+    """Feed a whole file to digests via a read-only mmap; return its header."""
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        for digest in digests:
+            digest.update(mm)
+        return mm[:20]
 
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            sha256_hash.update(chunk)
-            md5_hash.update(chunk)
 
-    return sha256_hash.hexdigest(), md5_hash.hexdigest()
+# Results are memoized per (path, st_dev, st_ino, st_mtime_ns, st_size), so a
+# file is only re-read after it changes
+_STAT_CACHE_SIZE = 1024
 
 
-def detect_binary_format(file_path: Path) -> str:
-    """Detect the binary format using file command."""
+def _stat_key(file_path: Path) -> tuple[str, int, int, int, int]:
+    st = os.stat(file_path)
+    return (str(file_path), st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def compute_hashes(file_path: Path, md5: bool = False) -> tuple[str, str | None]:
+    """Compute the SHA256 (and optionally MD5) hash of a file in a single pass.
+
+    MD5 is only an auxiliary identifier, so it is skipped unless ``md5`` is
+    set; the second element is then None.
+    """
+    return _compute_hashes_cached(_stat_key(file_path), md5)
+
+
+@lru_cache(maxsize=_STAT_CACHE_SIZE)
+def _compute_hashes_cached(
+    key: tuple[str, int, int, int, int], md5: bool
+) -> tuple[str, str | None]:
+    return _scan_binary(Path(key[0]), md5)[1:3]
+
+
+def _describe_file(file_path: Path) -> str:
+    """Return the ``file -b`` description, via libmagic when available."""
+    global _MAGIC
+    if magic is not None:
+        if _MAGIC is None:
+            _MAGIC = magic.Magic()
+        return _MAGIC.from_file(str(file_path))
+
+    result = subprocess.run(
+        ["file", "-b", str(file_path)],
+        capture_output=True,
+        text=True,
+        timeout=5,
+    )
+    return result.stdout
+
+
+# ELF e_machine -> format string, for the machines detect_binary_format names.
+# Anything else is left to libmagic so the result matches its description.
+_ELF64_MACHINES = {
+    0x3E: "elf64-x86-64",
+    0xB7: "elf64-aarch64",
+    0xF3: "elf64-riscv",
+    0x15: "elf64-ppc64",
+    0x16: "elf64-s390",
+    0x08: "elf64-mips",
+    0x2B: "elf64-sparc",
+}
+_ELF32_MACHINES = {
+    0x03: "elf32-i386",
+    0x28: "elf32-arm",
+    0xF3: "elf32-riscv",
+    0x08: "elf32-mips",
+    0x14: "elf32-ppc",
+    0x02: "elf32-sparc",
+    0x12: "elf32-sparc",
+}
+
+# Mach-O magic (as read little-endian) -> (64-bit, cputype byte order)
+_MACHO_MAGICS = {
+    0xFEEDFACF: (True, "<"),
+    0xCFFAEDFE: (True, ">"),
+    0xFEEDFACE: (False, "<"),
+    0xCEFAEDFE: (False, ">"),
+}
+_MACHO64_CPUS = {
+    0x01000007: "macho64-x86-64",
+    0x0100000C: "macho64-arm64",
+}
+
+
+def _sniff_format(header: bytes) -> str | None:
+    """Decode the format from the leading bytes of a file, or None if unsure."""
+    if header[:4] == b"\x7fELF" and len(header) >= 20:
+        ei_class, ei_data = header[4], header[5]
+        if ei_data not in (1, 2):
+            return None
+        machine = struct.unpack_from("<H" if ei_data == 1 else ">H", header, 18)[0]
+        if ei_class == 2:
+            return _ELF64_MACHINES.get(machine)
+        if ei_class == 1:
+            return _ELF32_MACHINES.get(machine)
+        return None
+
+    if header[:4] == b"\0asm":
+        return "wasm"
+
+    if len(header) >= 8:
+        macho = _MACHO_MAGICS.get(struct.unpack_from("<I", header)[0])
+        if macho is not None:
+            is_64, order = macho
+            if not is_64:
+                return "macho32"
+            cputype = struct.unpack_from(order + "I", header, 4)[0]
+            return _MACHO64_CPUS.get(cputype, "macho64")
+
+    return None
+
+
+def detect_binary_format(file_path: Path, header: bytes | None = None) -> str:
+    """Detect the binary format from its header, falling back to libmagic.
+
+    ELF, Mach-O and WebAssembly are recognised from the first 20 bytes
+    (read from the file unless ``header`` is given); everything else is
+    classified from the libmagic (or file command) description.
+    """
     try:
-        result = subprocess.run(
-            ["file", "-b", str(file_path)],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        output = result.stdout.strip()
-
-        # Parse common formats
-        if "ELF 64-bit" in output:
-            if "x86-64" in output:
-                return "elf64-x86-64"
-            elif "ARM aarch64" in output:
-                return "elf64-aarch64"
-            elif "RISC-V" in output:
-                return "elf64-riscv"
-            elif "PowerPC" in output or "ppc64" in output:
-                return "elf64-ppc64"
-            elif "S/390" in output:
-                return "elf64-s390"
-            elif "MIPS" in output:
-                return "elf64-mips"
-            elif "SPARC" in output:
-                return "elf64-sparc"
-            return "elf64"
-        elif "ELF 32-bit" in output:
-            if "Intel 80386" in output:
-                return "elf32-i386"
-            elif "ARM" in output:
-                return "elf32-arm"
-            elif "RISC-V" in output:
-                return "elf32-riscv"
-            elif "MIPS" in output:
-                return "elf32-mips"
-            elif "PowerPC" in output:
-                return "elf32-ppc"
-            elif "SPARC" in output:
-                return "elf32-sparc"
-            return "elf32"
-        elif "Mach-O 64-bit" in output:
-            if "x86_64" in output:
-                return "macho64-x86-64"
-            elif "arm64" in output:
-                return "macho64-arm64"
-            return "macho64"
-        elif "Mach-O" in output:
-            return "macho32"
-        elif "WebAssembly" in output or "wasm" in output.lower():
-            return "wasm"
-        elif "BPF" in output:
-            return "bpf"
-        elif "LLVM IR" in output:
-            return "llvm-ir"
-        elif "CUDA" in output or "PTX" in output:
-            return "ptx"
-        elif "data" in output.lower():
-            return "raw"
-        else:
-            return output[:50]  # Return truncated file output
+        if header is not None:
+            # The caller already has the bytes, so skip the stat; only the
+            # rare libmagic fallback would have been worth caching
+            return _sniff_format(header) or _format_from_file(file_path)
+        return _detect_binary_format_cached(_stat_key(file_path))
     except Exception:
+        # Outside the cache, so a transient failure is retried next time
         return "unknown"
 
 
+@lru_cache(maxsize=_STAT_CACHE_SIZE)
+def _detect_binary_format_cached(key: tuple[str, int, int, int, int]) -> str:
+    file_path = Path(key[0])
+    with open(file_path, "rb") as f:
+        header = f.read(20)
+    return _sniff_format(header) or _format_from_file(file_path)
+
+
+def _format_from_file(file_path: Path) -> str:
+    """Map the libmagic (or file command) description to a format string."""
+    output = _describe_file(file_path).strip()
+
+    # Parse common formats
+    if "ELF 64-bit" in output:
+        if "x86-64" in output:
+            return "elf64-x86-64"
+        elif "ARM aarch64" in output:
+            return "elf64-aarch64"
+        elif "RISC-V" in output:
+            return "elf64-riscv"
+        elif "PowerPC" in output or "ppc64" in output:
+            return "elf64-ppc64"
+        elif "S/390" in output:
+            return "elf64-s390"
+        elif "MIPS" in output:
+            return "elf64-mips"
+        elif "SPARC" in output:
+            return "elf64-sparc"
+        return "elf64"
+    elif "ELF 32-bit" in output:
+        if "Intel 80386" in output:
+            return "elf32-i386"
+        elif "ARM" in output:
+            return "elf32-arm"
+        elif "RISC-V" in output:
+            return "elf32-riscv"
+        elif "MIPS" in output:
+            return "elf32-mips"
+        elif "PowerPC" in output:
+            return "elf32-ppc"
+        elif "SPARC" in output:
+            return "elf32-sparc"
+        return "elf32"
+    elif "Mach-O 64-bit" in output:
+        if "x86_64" in output:
+            return "macho64-x86-64"
+        elif "arm64" in output:
+            return "macho64-arm64"
+        return "macho64"
+    elif "Mach-O" in output:
+        return "macho32"
+    elif "WebAssembly" in output or "wasm" in output.lower():
+        return "wasm"
+    elif "BPF" in output:
+        return "bpf"
+    elif "LLVM IR" in output:
+        return "llvm-ir"
+    elif "CUDA" in output or "PTX" in output:
+        return "ptx"
+    elif "data" in output.lower():
+        return "raw"
+    else:
+        return output[:50]  # Return truncated file output
+
+
+def _scan_binary(
+    file_path: Path, md5: bool = False
+) -> tuple[int, str, str | None, bytes]:
+    """Size, digests and leading header bytes of a file from one read.
+
+    The file is opened once: its size comes from fstat and both the hashes
+    and the format-sniffing header are taken from the same buffer (a
+    read-only mmap for large files).
+    """
+    sha256_hash = hashlib.sha256()
+    md5_hash = hashlib.md5() if md5 else None
+    digests = [h for h in (sha256_hash, md5_hash) if h is not None]
+
+    with open(file_path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > _MMAP_MIN_SIZE:
+            header = _hash_mapped(f.fileno(), digests)
+        else:
+            data = f.read()
+            for digest in digests:
+                digest.update(data)
+            header = data[:20]
+
+    return (
+        size,
+        sha256_hash.hexdigest(),
+        md5_hash.hexdigest() if md5_hash is not None else None,
+        header,
+    )
+
+
 def generate_metadata(
     binary_path: Path,
     program: ProgramConfig,
     target: TargetConfig,
     config: CompilationConfig,
     compiler_command: list[str],
+    md5: bool = False,
 ) -> BinaryMetadata:
     """Generate metadata for a compiled binary."""
-    sha256, md5 = compute_hashes(binary_path)
-    binary_format = detect_binary_format(binary_path)
+    size, sha256, md5_digest, header = _scan_binary(binary_path, md5)
+    binary_format = detect_binary_format(binary_path, header)
 
     return BinaryMetadata(
         path=str(binary_path),
-        size_bytes=binary_path.stat().st_size,
+        size_bytes=size,
         format=binary_format,
         program_name=program.name,
         program_language=program.language,
@@ -195,7 +372,7 @@ def generate_metadata(
         cpu=config.cpu,
         compiler_command=" ".join(compiler_command),
         sha256=sha256,
-        md5=md5,
+        md5=md5_digest,
         build_timestamp=datetime.now(timezone.utc).isoformat(),
     )
 
@@ -218,6 +395,18 @@ class ManifestEntry:
     sha256: str
 
 
+# ManifestEntry is flat, so a plain field walk replaces asdict()'s deep copy
+_MANIFEST_FIELDS = tuple(f.name for f in fields(ManifestEntry))
+
+
+# binaries.jsonl is coalesced in memory and written in chunks of this size
+_JSONL_FLUSH_BYTES = 64 << 20
+
+
+def _entry_dict(entry: ManifestEntry) -> dict[str, Any]:
+    return {name: getattr(entry, name) for name in _MANIFEST_FIELDS}
+
+
 class ManifestBuilder:
     """Builds the master manifest file."""
 
@@ -277,15 +466,44 @@ class ManifestBuilder:
             "targets": sorted(self.targets),
             "programs": sorted(self.programs),
             "configurations": sorted(self.configs),
-            "binaries": [asdict(e) for e in self.entries],
         }
 
         manifest_path = output_dir / "manifest.json"
+        jsonl_path = output_dir / "binaries.jsonl"
+
+        if orjson is not None:
+            # orjson serializes the dataclasses directly; no dicts needed
+            manifest["binaries"] = self.entries
+            with open(manifest_path, "wb") as f:
+                f.write(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+
+            # Also save a line-delimited version for streaming
+            with open(jsonl_path, "wb") as f:
+                buf = bytearray()
+                for entry in self.entries:
+                    buf += orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+                    if len(buf) >= _JSONL_FLUSH_BYTES:
+                        f.write(buf)
+                        buf.clear()
+                f.write(buf)
+            return
+
+        # Entry dicts are built once and shared by both files
+        binaries = [_entry_dict(e) for e in self.entries]
+        manifest["binaries"] = binaries
         with open(manifest_path, "w") as f:
             json.dump(manifest, f, indent=2)
 
         # Also save a line-delimited version for streaming
-        jsonl_path = output_dir / "binaries.jsonl"
         with open(jsonl_path, "w") as f:
-            for entry in self.entries:
-                f.write(json.dumps(asdict(entry)) + "\n")
+            lines: list[str] = []
+            pending = 0
+            for entry in binaries:
+                line = json.dumps(entry) + "\n"
+                lines.append(line)
+                pending += len(line)
+                if pending >= _JSONL_FLUSH_BYTES:
+                    f.write("".join(lines))
+                    lines.clear()
+                    pending = 0
+            f.write("".join(lines))
@@ -11,16 +11,26 @@ confusion patterns, and score distributions.
 """
 
 import argparse
+import atexit
+import hashlib
 import json
 import os
+import selectors
 import subprocess
 import sys
+import threading
 import time
 from collections import Counter, defaultdict
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from pathlib import Path
 
+try:
+    import xxhash
+except ImportError:  # optional; SHA-256 keys the result cache instead
+    xxhash = None
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -28,6 +38,9 @@ from pathlib import Path
 CLASSIFIER_BIN = Path(__file__).parent / "target" / "release" / "isa-classify"
 OBJECTS_DIR = Path(__file__).parent.parent / "armgen" / "objects"
 FIRMWARE_DIR = Path(__file__).parent.parent / "armgen" / "firmware"
+# Per-file limit (seconds) for single-ISA classifier runs
+CLASSIFY_TIMEOUT = 30
+RESULT_CACHE = Path(__file__).parent / "accuracy_cache.json"
 
 # Map from oracle family names to classifier ISA names
 FAMILY_TO_ISA = {
@@ -67,8 +80,30 @@ ACCEPTABLE_ALIASES = {
     "sparc64": {"sparc", "sparc64"},
 }
 
+# Expected ISA -> detected names accepted outright (itself plus its aliases)
+ACCEPT = {
+    isa: frozenset(ACCEPTABLE_ALIASES.get(isa, set()) | {isa})
+    for isa in set(FAMILY_TO_ISA.values()) | ACCEPTABLE_ALIASES.keys()
+}
+
+# Oracle family -> accepted detected names, resolving both maps at once
+FAMILY_TO_ACCEPT = {fam: ACCEPT[isa] for fam, isa in FAMILY_TO_ISA.items()}
+
+
+@lru_cache(maxsize=None)
+def is_acceptable(expected: str, detected: str) -> bool:
+    """Whether a detected ISA name counts as correct for the expected one.
+
+    Direct and alias matches are a set lookup; anything else falls back to
+    the sub-variant check (either name containing the other). The ISA
+    vocabulary is small, so each pair is only ever evaluated once.
+    """
+    if detected in ACCEPT.get(expected, (expected,)):
+        return True
+    return expected in detected or detected in expected
+
 
-@dataclass
+@dataclass(slots=True)
 class ClassifyResult:
     """Result from running the classifier on a single file."""
     path: str
@@ -88,7 +123,7 @@ def run_classifier(path: str, mode: str = "thorough") -> dict:
         result = subprocess.run(
             [str(CLASSIFIER_BIN), "-f", "json", "-m", mode,
              "--min-confidence", "0.01", str(path)],
-            capture_output=True, text=True, timeout=30,
+            capture_output=True, text=True, timeout=CLASSIFY_TIMEOUT,
         )
         if result.returncode != 0:
             return {"error": result.stderr.strip(), "path": path}
@@ -107,14 +142,306 @@ def run_classifier(path: str, mode: str = "thorough") -> dict:
         return {"error": str(e), "path": path}
 
 
+# Per-thread `isa-classify --server` handle (and a selector on its stdout),
+# spawned on first use; _servers tracks every live one so they can be
+# stopped when an analysis finishes
+_local = threading.local()
+_servers: list[subprocess.Popen] = []
+_servers_lock = threading.Lock()
+
+
+def _stop_server(server: subprocess.Popen) -> None:
+    try:
+        server.stdin.close()  # EOF ends the server loop
+        server.wait(timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        server.kill()
+        server.wait()
+
+
+def stop_classifier_servers() -> None:
+    """Stop every classifier server started by query_classifier_server."""
+    with _servers_lock:
+        servers = _servers[:]
+        _servers.clear()
+    for server in servers:
+        _stop_server(server)
+
+
+atexit.register(stop_classifier_servers)
+
+
+def _drop_server() -> None:
+    """Kill this thread's server so the next query spawns a fresh one."""
+    server = _local.server
+    _local.server = None
+    _local.selector.close()
+    with _servers_lock:
+        if server in _servers:
+            _servers.remove(server)
+    server.kill()
+    server.wait()
+
+
+def _thread_server(mode: str) -> subprocess.Popen:
+    server = getattr(_local, "server", None)
+    if server is not None and (server.poll() is not None or server.stdin.closed):
+        _drop_server()  # exited, or stopped by stop_classifier_servers
+        server = None
+    if server is None:
+        server = subprocess.Popen(
+            [str(CLASSIFIER_BIN), "--server", "-f", "json", "-m", mode,
+             "--min-confidence", "0.01"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+        _local.server = server
+        _local.selector = selectors.DefaultSelector()
+        _local.selector.register(server.stdout, selectors.EVENT_READ)
+        with _servers_lock:
+            _servers.append(server)
+    return server
+
+
+def _read_response(server: subprocess.Popen, timeout: float) -> bytes | None:
+    """Read one response line; b"" if the server exited, None on timeout."""
+    fd = server.stdout.fileno()
+    deadline = time.monotonic() + timeout
+    buf = bytearray()
+    while b"\n" not in buf:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not _local.selector.select(remaining):
+            return None
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            return b""
+        buf += chunk
+    return bytes(buf)
+
+
+def query_classifier_server(path: str, mode: str = "thorough") -> dict:
+    """Classify one file through this thread's persistent classifier.
+
+    The server answers each path with one JSON line, within the same
+    per-file limit as run_classifier. A server that hangs or dies is
+    killed and replaced on the next call. run_analysis stops all servers
+    when it finishes (and atexit covers direct use).
+    """
+    try:
+        server = _thread_server(mode)
+        server.stdin.write(os.fsencode(path) + b"\n")
+        server.stdin.flush()
+        line = _read_response(server, CLASSIFY_TIMEOUT)
+    except Exception as e:
+        if getattr(_local, "server", None) is not None:
+            _drop_server()
+        return {"error": str(e), "path": path}
+
+    if line is None:
+        _drop_server()
+        return {"error": "timeout", "path": path}
+    if not line:
+        _drop_server()
+        return {"error": "classifier server exited", "path": path}
+
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError as e:
+        return {"error": f"json parse: {e}", "path": path}
+    if "error" in data:
+        # Same wording as the one-shot CLI's stderr
+        data["error"] = f"Error analyzing {path}: {data['error']}"
+    return data
+
+
+def _parse_json_stream(text: str, partial: bool = False) -> list[dict]:
+    """Parse concatenated (pretty-printed) JSON documents from one stream.
+
+    With partial=True, a truncated last document (the output of a killed
+    or crashed process) is dropped instead of raising.
+    """
+    decoder = json.JSONDecoder()
+    docs = []
+    idx, end = 0, len(text)
+    while True:
+        while idx < end and text[idx].isspace():
+            idx += 1
+        if idx >= end:
+            return docs
+        try:
+            data, idx = decoder.raw_decode(text, idx)
+        except json.JSONDecodeError:
+            if partial:
+                return docs
+            raise
+        if isinstance(data, list):
+            docs.extend(data)
+        else:
+            docs.append(data)
+
+
+def run_classifier_batch(paths: list[str], mode: str = "thorough") -> dict[str, dict]:
+    """Run the classifier once over several files; return parsed JSON per path.
+
+    The CLI prints one JSON document per file it could analyze and an
+    "Error analyzing <path>: ..." line on stderr for each one it could not,
+    so a failing file does not lose the results of the rest of the batch.
+    If the batch times out or crashes, the files it finished keep their
+    results. Any path the classifier gave neither a result nor an error for
+    is rerun on its own, so only the offending file ends up with an error.
+    """
+    try:
+        result = subprocess.run(
+            [str(CLASSIFIER_BIN), "-f", "json", "-m", mode,
+             "--min-confidence", "0.01", *map(str, paths)],
+            # One per-file budget for the whole batch: a hang costs at most
+            # this plus its own rerun, and whatever a slow batch had not
+            # reached yet goes through the per-file fallback
+            capture_output=True, text=True, timeout=CLASSIFY_TIMEOUT,
+        )
+    except subprocess.TimeoutExpired as e:
+        # Output captured before the kill is always bytes
+        docs = _parse_json_stream(
+            (e.stdout or b"").decode(errors="replace"), partial=True,
+        )
+        stderr = (e.stderr or b"").decode(errors="replace")
+    except OSError:
+        return {path: run_classifier(path, mode) for path in paths}
+    else:
+        # A crash (e.g. a panic) can cut the last document short too
+        docs = _parse_json_stream(result.stdout, partial=result.returncode != 0)
+        stderr = result.stderr
+
+    by_path = {doc.get("file"): doc for doc in docs}
+    stderr_lines = stderr.strip().splitlines()
+    out = {}
+    for path in paths:
+        data = by_path.get(path)
+        if data is None:
+            prefix = f"Error analyzing {path}: "
+            message = next(
+                (line for line in stderr_lines if line.startswith(prefix)),
+                None,
+            )
+            if message is None:
+                data = run_classifier(path, mode)
+            else:
+                data = {"error": message, "path": path}
+        out[path] = data
+    return out
+
+
+# Content hash -> classifier JSON for blobs this build of the classifier
+# has already seen; None when caching is disabled. The key is only an
+# identifier, so the much faster xxh3-128 is used when it is installed.
+_result_cache: dict[str, dict] | None = None
+_CACHE_KEY_NAME, _CACHE_KEY_HASH = (
+    ("xxh3_128", xxhash.xxh3_128) if xxhash is not None
+    else ("sha256", hashlib.sha256)
+)
+_CACHE_READ_SIZE = 1 << 20
+
+
+def _classifier_stamp() -> str:
+    """Identify the classifier build so a rebuild invalidates the cache."""
+    st = CLASSIFIER_BIN.stat()
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def load_result_cache(cache_path: Path) -> None:
+    """Enable the blob result cache, seeding it from cache_path if valid."""
+    global _result_cache
+    _result_cache = {}
+    try:
+        with open(cache_path) as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return
+    if (data.get("classifier") == _classifier_stamp()
+            and data.get("key", "sha256") == _CACHE_KEY_NAME):
+        _result_cache = data.get("results", {})
+
+
+def save_result_cache(cache_path: Path) -> None:
+    """Persist the blob result cache (no-op when caching is disabled)."""
+    if _result_cache is None:
+        return
+    with open(cache_path, "w") as f:
+        json.dump({
+            "classifier": _classifier_stamp(),
+            "key": _CACHE_KEY_NAME,
+            "results": _result_cache,
+        }, f)
+
+
+def _cache_lookup(path: str) -> tuple[str | None, dict | None]:
+    """Return (content hash, cached classifier output) for path.
+
+    An unreadable file yields (None, None) so it is classified uncached and
+    the classifier reports the error for that file alone.
+    """
+    if _result_cache is None:
+        return None, None
+    content_hash = _CACHE_KEY_HASH()
+    buf = bytearray(_CACHE_READ_SIZE)
+    view = memoryview(buf)
+    try:
+        with open(path, "rb", buffering=0) as f:
+            while n := f.readinto(buf):
+                content_hash.update(view[:n])
+    except OSError:
+        return None, None
+    digest = content_hash.hexdigest()
+    return digest, _result_cache.get(digest)
+
+
+def _cache_store(digest: str | None, result: dict) -> None:
+    # Errors (timeouts etc.) are not cached so they are retried next run
+    if digest is not None and "error" not in result:
+        _result_cache[digest] = result
+
+
 def classify_blob(args: tuple) -> ClassifyResult:
-    """Classify a single blob file. Runs in worker process."""
+    """Classify a single blob file. Runs in a worker thread."""
+    path, _ = args
+    digest, result = _cache_lookup(path)
+    if result is None:
+        result = run_classifier(path)
+        _cache_store(digest, result)
+    return _blob_result(args, result)
+
+
+def classify_blob_server(args: tuple) -> ClassifyResult:
+    """Classify a single blob file via the worker's classifier server."""
+    path, _ = args
+    digest, result = _cache_lookup(path)
+    if result is None:
+        result = query_classifier_server(path)
+        _cache_store(digest, result)
+    return _blob_result(args, result)
+
+
+def classify_blob_batch(batch: list[tuple]) -> list[ClassifyResult]:
+    """Classify several blob files with one classifier process."""
+    lookups = {path: _cache_lookup(path) for path, _ in batch}
+    misses = [path for path, (_, cached) in lookups.items() if cached is None]
+    fresh = run_classifier_batch(misses) if misses else {}
+
+    results = []
+    for args in batch:
+        digest, result = lookups[args[0]]
+        if result is None:
+            result = fresh[args[0]]
+            _cache_store(digest, result)
+        results.append(_blob_result(args, result))
+    return results
+
+
+def _blob_result(args: tuple, result: dict) -> ClassifyResult:
+    """Build the ClassifyResult for one blob from its classifier output."""
     path, expected_family = args
     expected_isa = FAMILY_TO_ISA.get(expected_family, expected_family)
     file_size = os.path.getsize(path)
 
-    result = run_classifier(path)
-
     if "error" in result:
         return ClassifyResult(
             path=path, expected_isa=expected_isa,
@@ -131,17 +458,7 @@ def classify_blob(args: tuple) -> ClassifyResult:
     candidates = result.get("candidates", [])
 
     # Determine correctness
-    expected_lower = expected_isa.lower()
-    detected_lower = (detected or "").lower()
-
-    # Direct match
-    correct = detected_lower == expected_lower
-    # Alias match
-    if not correct and expected_lower in ACCEPTABLE_ALIASES:
-        correct = detected_lower in ACCEPTABLE_ALIASES[expected_lower]
-    # Also check if detected is a sub-variant
-    if not correct:
-        correct = expected_lower in detected_lower or detected_lower in expected_lower
+    correct = is_acceptable(expected_isa.lower(), (detected or "").lower())
 
     return ClassifyResult(
         path=path, expected_isa=expected_isa,
@@ -216,10 +533,11 @@ def classify_firmware_section(args: tuple) -> ClassifyResult:
     # Build acceptable set from ground truth
     acceptable = set()
     for fam in all_families:
-        isa_name = FAMILY_TO_ISA.get(fam, fam).lower()
-        acceptable.add(isa_name)
-        if isa_name in ACCEPTABLE_ALIASES:
-            acceptable.update(ACCEPTABLE_ALIASES[isa_name])
+        accept = FAMILY_TO_ACCEPT.get(fam)
+        if accept is None:
+            isa_name = fam.lower()
+            accept = ACCEPT.get(isa_name, (isa_name,))
+        acceptable.update(accept)
 
     # Correct if ANY expected ISA is in the detected set
     correct = bool(detected_set & acceptable)
@@ -233,6 +551,24 @@ def classify_firmware_section(args: tuple) -> ClassifyResult:
     )
 
 
+def _iter_bin_files(directory: str):
+    """Yield paths of *.bin files under directory, in rglob's pre-order.
+
+    Files of a directory come before its subdirectories; symlinked
+    directories are not followed. DirEntry avoids building a Path and
+    re-stat'ing each entry.
+    """
+    subdirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.name.endswith(".bin") and entry.is_file():
+                yield entry.path
+    for subdir in subdirs:
+        yield from _iter_bin_files(subdir)
+
+
 def collect_blob_tasks(objects_dir: Path, max_per_family: int = 0) -> list[tuple]:
     """Collect (path, family) pairs for all blob files."""
     tasks = []
@@ -241,8 +577,8 @@ def collect_blob_tasks(objects_dir: Path, max_per_family: int = 0) -> list[tuple
             continue
         family = family_dir.name
         count = 0
-        for bin_file in family_dir.rglob("*.bin"):
-            tasks.append((str(bin_file), family))
+        for bin_file in _iter_bin_files(str(family_dir)):
+            tasks.append((bin_file, family))
             count += 1
             if max_per_family and count >= max_per_family:
                 break
@@ -266,8 +602,26 @@ def collect_firmware_tasks(firmware_dir: Path, max_per_dir: int = 0) -> list[tup
     return tasks
 
 
-def run_analysis(tasks, classify_fn, jobs: int, desc: str) -> list[ClassifyResult]:
-    """Run classification tasks in parallel."""
+def _guarded_classify(classify_fn, task) -> tuple[object, str | None]:
+    """Run one task, returning the exception text instead of raising.
+
+    executor.map stops at the first exception, so failures are carried back
+    as values to keep one bad file from aborting the whole run.
+    """
+    try:
+        return classify_fn(task), None
+    except Exception as e:
+        return None, str(e)
+
+
+def run_analysis(
+    tasks, classify_fn, jobs: int, desc: str, batch_size: int = 1,
+) -> list[ClassifyResult]:
+    """Run classification tasks in parallel.
+
+    With batch_size > 1, classify_fn is called with lists of up to
+    batch_size tasks and returns a list of results.
+    """
     results = []
     total = len(tasks)
     start = time.time()
@@ -276,20 +630,35 @@ def run_analysis(tasks, classify_fn, jobs: int, desc: str) -> list[ClassifyResul
     print(f"  {desc}: {total} files, {jobs} workers")
     print(f"{'='*70}")
 
-    with ProcessPoolExecutor(max_workers=jobs) as executor:
-        futures = {executor.submit(classify_fn, t): t for t in tasks}
-        done = 0
-        for future in as_completed(futures):
-            done += 1
-            try:
-                result = future.result()
-                results.append(result)
-            except Exception as e:
-                print(f"  ERROR: {e}", file=sys.stderr)
-            if done % 200 == 0 or done == total:
-                elapsed = time.time() - start
-                rate = done / elapsed if elapsed > 0 else 0
-                print(f"  [{done:5d}/{total}] {rate:.0f} files/s", flush=True)
+    if batch_size > 1:
+        work = [tasks[i:i + batch_size] for i in range(0, total, batch_size)]
+    else:
+        work = tasks
+
+    # Workers only wait on classifier subprocesses (which release the GIL),
+    # so threads are enough and nothing has to be pickled
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            outcomes = executor.map(partial(_guarded_classify, classify_fn), work)
+            done = 0
+            for item, (result, error) in zip(work, outcomes):
+                prev = done
+                if batch_size > 1:
+                    done += len(item)
+                    if error is None:
+                        results.extend(result)
+                else:
+                    done += 1
+                    if error is None:
+                        results.append(result)
+                if error is not None:
+                    print(f"  ERROR: {error}", file=sys.stderr)
+                if done // 200 != prev // 200 or done == total:
+                    elapsed = time.time() - start
+                    rate = done / elapsed if elapsed > 0 else 0
+                    print(f"  [{done:5d}/{total}] {rate:.0f} files/s", flush=True)
+    finally:
+        stop_classifier_servers()
 
     elapsed = time.time() - start
     print(f"  Completed in {elapsed:.1f}s ({total/elapsed:.0f} files/s)")
@@ -306,44 +675,65 @@ def print_report(results: list[ClassifyResult], title: str):
     print(f"  REPORT: {title}")
     print(f"{'='*70}")
 
-    total = len(results)
-    correct = sum(1 for r in results if r.correct)
-    errors = sum(1 for r in results if r.error)
-    wrong = total - correct - errors
-
-    print(f"\n  Overall: {correct}/{total} correct "
-          f"({100*correct/total:.1f}%), "
-          f"{wrong} wrong, {errors} errors")
-
-    # --- Per-family breakdown ---
+    # --- Gather every statistic in a single pass ---
     family_stats: dict[str, dict] = defaultdict(lambda: {
         "total": 0, "correct": 0, "errors": 0,
-        "confidences": [], "wrong_detections": [],
-        "sizes": [],
+        "confidence_sum": 0, "size_sum": 0,
     })
+    confusion: Counter = Counter()
+    error_types: Counter = Counter()
+    low_conf_by_family: dict[str, list] = defaultdict(list)
+    small_fails = medium_fails = large_fails = 0
+    correct = errors = low_conf = 0
 
     for r in results:
-        s = family_stats[r.expected_family]
+        r_correct, r_error = r.correct, r.error
+        family = r.expected_family
+        s = family_stats[family]
         s["total"] += 1
-        s["sizes"].append(r.file_size)
-        if r.error:
+        s["size_sum"] += r.file_size
+        if r_correct:
+            correct += 1
+            if r.confidence < 0.5:
+                low_conf += 1
+                low_conf_by_family[family].append(r.confidence)
+        if r_error:
+            errors += 1
             s["errors"] += 1
-        elif r.correct:
+            # Simplify error message
+            error_types[r_error[:80]] += 1
+        elif r_correct:
             s["correct"] += 1
-            s["confidences"].append(r.confidence)
+            s["confidence_sum"] += r.confidence
         else:
-            s["wrong_detections"].append(r.detected_isa or "none")
+            detected = r.detected_isa or "none"
+            confusion[(family, detected)] += 1
+            if r.file_size < 256:
+                small_fails += 1
+            elif r.file_size < 4096:
+                medium_fails += 1
+            else:
+                large_fails += 1
+
+    total = len(results)
+    wrong = total - correct - errors
+
+    print(f"\n  Overall: {correct}/{total} correct "
+          f"({100*correct/total:.1f}%), "
+          f"{wrong} wrong, {errors} errors")
 
+    # --- Per-family breakdown ---
     print(f"\n  {'Family':<18} {'Acc%':>6} {'Correct':>8} {'Wrong':>6} "
           f"{'Err':>5} {'Total':>6} {'AvgConf':>8} {'AvgSize':>10}")
     print(f"  {'-'*18} {'-'*6} {'-'*8} {'-'*6} {'-'*5} {'-'*6} {'-'*8} {'-'*10}")
 
     for family in sorted(family_stats.keys()):
         s = family_stats[family]
-        acc = 100 * s["correct"] / s["total"] if s["total"] else 0
-        avg_conf = (sum(s["confidences"]) / len(s["confidences"])
-                    if s["confidences"] else 0)
-        avg_size = sum(s["sizes"]) / len(s["sizes"]) if s["sizes"] else 0
+        # Per-family sums stand in for per-row lists; every family has at
+        # least one result, and the confidences summed are the correct ones
+        acc = 100 * s["correct"] / s["total"]
+        avg_conf = s["confidence_sum"] / s["correct"] if s["correct"] else 0
+        avg_size = s["size_sum"] / s["total"]
         wrong = s["total"] - s["correct"] - s["errors"]
         marker = " ***" if acc < 80 else (" *" if acc < 95 else "")
         print(f"  {family:<18} {acc:5.1f}% {s['correct']:>8} {wrong:>6} "
@@ -351,11 +741,6 @@ def print_report(results: list[ClassifyResult], title: str):
               f"{avg_size:>9.0f}{marker}")
 
     # --- Confusion matrix (top misclassifications) ---
-    confusion: Counter = Counter()
-    for r in results:
-        if not r.correct and not r.error:
-            confusion[(r.expected_family, r.detected_isa or "none")] += 1
-
     if confusion:
         print(f"\n  Top Misclassifications:")
         print(f"  {'Expected':<18} {'Detected':<18} {'Count':>6}")
@@ -364,37 +749,23 @@ def print_report(results: list[ClassifyResult], title: str):
             print(f"  {expected:<18} {detected:<18} {count:>6}")
 
     # --- Low-confidence correct detections ---
-    low_conf = [r for r in results if r.correct and r.confidence < 0.5]
     if low_conf:
-        print(f"\n  Low-confidence correct detections (<50%): {len(low_conf)}")
-        by_family: dict[str, list] = defaultdict(list)
-        for r in low_conf:
-            by_family[r.expected_family].append(r.confidence)
-        for fam in sorted(by_family.keys()):
-            confs = by_family[fam]
+        print(f"\n  Low-confidence correct detections (<50%): {low_conf}")
+        for fam in sorted(low_conf_by_family.keys()):
+            confs = low_conf_by_family[fam]
             print(f"    {fam:<18} {len(confs):>4} files, "
                   f"avg conf {sum(confs)/len(confs):.3f}, "
                   f"min {min(confs):.3f}")
 
     # --- Size-related failures ---
-    failed = [r for r in results if not r.correct and not r.error]
-    if failed:
-        small_fails = [r for r in failed if r.file_size < 256]
-        medium_fails = [r for r in failed if 256 <= r.file_size < 4096]
-        large_fails = [r for r in failed if r.file_size >= 4096]
+    if confusion:
         print(f"\n  Failures by size:")
-        print(f"    <256 bytes:   {len(small_fails):>4}")
-        print(f"    256-4KB:      {len(medium_fails):>4}")
-        print(f"    4KB+:         {len(large_fails):>4}")
+        print(f"    <256 bytes:   {small_fails:>4}")
+        print(f"    256-4KB:      {medium_fails:>4}")
+        print(f"    4KB+:         {large_fails:>4}")
 
     # --- Error breakdown ---
     if errors:
-        error_types: Counter = Counter()
-        for r in results:
-            if r.error:
-                # Simplify error message
-                err = r.error[:80]
-                error_types[err] += 1
         print(f"\n  Error types:")
         for err, count in error_types.most_common(10):
             print(f"    {count:>4}x  {err}")
@@ -466,7 +837,26 @@ def main():
     )
     parser.add_argument(
         "--jobs", "-j", type=int, default=8,
-        help="Parallel workers",
+        help="Parallel worker threads (one classifier process each)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=32,
+        help="Blobs per classifier invocation (1 = one process per file)",
+    )
+    parser.add_argument(
+        "--server", action="store_true",
+        help="Keep one 'isa-classify --server' process per worker "
+             "(overrides --batch-size)",
+    )
+    parser.add_argument(
+        "--cache", type=Path, default=RESULT_CACHE,
+        help="Blob result cache, keyed by content hash and classifier "
+             "build; accuracy numbers may come from cached classifier "
+             "output (use --no-cache to reclassify everything)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Classify every blob even if a cached result exists",
     )
     parser.add_argument(
         "--blobs-only", action="store_true",
@@ -496,10 +886,20 @@ def main():
         blob_tasks = collect_blob_tasks(
             args.objects_dir, max_per_family=args.max_blobs_per_family,
         )
+        if args.server:
+            classify_fn, batch_size = classify_blob_server, 1
+        elif args.batch_size > 1:
+            classify_fn, batch_size = classify_blob_batch, args.batch_size
+        else:
+            classify_fn, batch_size = classify_blob, 1
+        if not args.no_cache:
+            load_result_cache(args.cache)
         blob_results = run_analysis(
-            blob_tasks, classify_blob, args.jobs,
+            blob_tasks, classify_fn, args.jobs,
             "Phase 1: Object Blob Classification",
+            batch_size=batch_size,
         )
+        save_result_cache(args.cache)
         print_report(blob_results, "Object Blobs (raw machine code)")
 
     # --- Phase 2: Firmware images ---
@@ -7,6 +7,7 @@ use isa_classifier::{
     detect_multi_isa, detect_payload, CandidatesFormatter, ClassifierOptions, DetectionPayload,
     HumanFormatter, JsonFormatter, PayloadFormatter, ShortFormatter,
 };
+use std::io::{BufRead, Write};
 use std::path::PathBuf;
 use std::process::ExitCode;
 
@@ -59,6 +60,11 @@ struct Cli {
     /// Quiet mode (only output essential info)
     #[arg(short, long)]
     quiet: bool,
+
+    /// Server mode: read file paths from stdin, one per line, and answer
+    /// each with one line of compact JSON on stdout
+    #[arg(long)]
+    server: bool,
 }
 
 #[derive(Subcommand, Debug)]
@@ -199,6 +205,10 @@ fn main() -> ExitCode {
         }
     }
 
+    if cli.server {
+        return run_server(&cli);
+    }
+
     // Default mode: classify individual files
     if cli.files.is_empty() {
         eprintln!("Error: no input files specified. Use --help for usage.");
@@ -246,6 +256,67 @@ fn main() -> ExitCode {
     }
 }
 
+// ---------------------------------------------------------------------------
+// Server mode
+// ---------------------------------------------------------------------------
+
+/// Classify paths read from stdin until EOF, one per line.
+///
+/// Output is flushed after every answer so a driver can keep one
+/// long-lived process and read responses synchronously.
+fn run_server(cli: &Cli) -> ExitCode {
+    let options = build_options(cli);
+    let formatter = JsonFormatter::compact();
+    let stdin = std::io::stdin();
+    let stdout = std::io::stdout();
+
+    serve(stdin.lock(), stdout.lock(), &options, &formatter);
+
+    ExitCode::SUCCESS
+}
+
+/// Answer each non-blank line of `input` with exactly one line on `output`:
+/// the compact JSON payload, or `{"file": ..., "error": ...}` if the file
+/// could not be analyzed. Stops at EOF or on the first I/O error.
+fn serve<R: BufRead, W: Write>(
+    input: R,
+    mut output: W,
+    options: &ClassifierOptions,
+    formatter: &JsonFormatter,
+) {
+    for line in input.lines() {
+        let Ok(line) = line else {
+            break;
+        };
+        if line.is_empty() {
+            continue;
+        }
+        let path = PathBuf::from(&line);
+        let response = match classify_to_json(&path, options, formatter) {
+            Ok(json) => json,
+            Err(e) => serde_json::json!({ "file": line, "error": e.to_string() }).to_string(),
+        };
+        if writeln!(output, "{}", response)
+            .and_then(|()| output.flush())
+            .is_err()
+        {
+            // Driver went away
+            break;
+        }
+    }
+}
+
+/// Classify one file and render it with the given JSON formatter.
+fn classify_to_json(
+    path: &PathBuf,
+    options: &ClassifierOptions,
+    formatter: &JsonFormatter,
+) -> Result<String, Box<dyn std::error::Error>> {
+    let data = std::fs::read(path)?;
+    let payload = detect_payload(&data, options)?;
+    Ok(formatter.format_payload(&payload, path))
+}
+
 // ---------------------------------------------------------------------------
 // Batch subcommand
 // ---------------------------------------------------------------------------
@@ -603,6 +674,43 @@ mod tests {
         assert!(matches!(cli.format, OutputFormat::Json));
     }
 
+    #[test]
+    fn test_server_flag() {
+        let cli = Cli::try_parse_from(["isa-classify", "--server", "-f", "json"]).unwrap();
+        assert!(cli.server);
+        assert!(cli.files.is_empty());
+    }
+
+    #[test]
+    fn test_serve_one_line_per_request() {
+        // The test binary itself is a valid executable for the host
+        let good = std::env::current_exe().unwrap();
+        let dir = tempfile::tempdir().unwrap();
+        let missing = dir.path().join("missing.bin");
+        let input = format!("{}\n\n{}\n", good.display(), missing.display());
+
+        let mut output = Vec::new();
+        serve(
+            std::io::Cursor::new(input),
+            &mut output,
+            &ClassifierOptions::new(),
+            &JsonFormatter::compact(),
+        );
+
+        let output = String::from_utf8(output).unwrap();
+        let lines: Vec<&str> = output.lines().collect();
+        assert_eq!(lines.len(), 2);
+
+        let ok: serde_json::Value = serde_json::from_str(lines[0]).unwrap();
+        assert!(ok.get("error").is_none());
+
+        let err: serde_json::Value = serde_json::from_str(lines[1]).unwrap();
+        let err = err.as_object().unwrap();
+        assert_eq!(err.len(), 2);
+        assert_eq!(err["file"], missing.display().to_string());
+        assert!(err["error"].is_string());
+    }
+
     #[test]
     fn test_multi_isa_flag() {
         let cli = Cli::try_parse_from(["isa-classify", "--multi-isa", "test.bin"]).unwrap();